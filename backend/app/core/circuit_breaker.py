@@ -0,0 +1,68 @@
+from __future__ import annotations
+import time
+
+class CircuitBreaker:
+    '''
+    Minimal circuit breaker for a remote dependency (Redis).
+
+    States:
+      - closed    -> calls go through; consecutive failures are counted
+      - open      -> calls are skipped until reset_seconds have passed
+      - half_open -> one probe call is let through; success closes, failure re-opens
+
+    Single event loop only: state changes are not guarded by a lock.
+    '''
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_seconds: float = 10.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.trips = 0
+        self.degraded_calls = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - (self.opened_at or 0) >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.degraded_calls += 1
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        '''Give up an in-flight probe without judging Redis (e.g. request cancelled).'''
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_for_seconds": round(time.monotonic() - self.opened_at, 3) if self.opened_at else 0.0,
+            "trips": self.trips,
+            "degraded_calls": self.degraded_calls,
+        }
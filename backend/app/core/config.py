@@ -12,6 +12,14 @@ class Settings(BaseSettings):
     RATE_LIMIT_PER_MIN_BALANCE: int = 60
     RATE_LIMIT_PER_MIN_TRANSFER: int = 10
 
+    REDIS_TIMEOUT_SECONDS: float = 0.1
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 3
+    REDIS_BREAKER_RESET_SECONDS: float = 10.0
+
+    SCHEDULER_BATCH_SIZE: int = 50
+    SCHEDULER_POLL_SECONDS: float = 5.0
+    SCHEDULER_SPREAD_SECONDS: int = 300
+
     CORS_ORIGINS: str = "http://localhost:3000"
 
     def cors_origins_list(self) -> List[str]:
@@ -1,68 +1,55 @@
+'''
+Fixed-window rate limiting rules, enforced by RedisGuardMiddleware.
+
+Keys:
+  rl:{user_or_ip}:{route}:{minute_bucket}
+
+Limits:
+  - GET */balance  -> RATE_LIMIT_PER_MIN_BALANCE
+  - POST /transfers -> RATE_LIMIT_PER_MIN_TRANSFER
+'''
+
 from __future__ import annotations
-import time
+from typing import Optional, Tuple
 from fastapi import Request
-from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 
 def _minute_bucket(ts: float) -> int:
     return int(ts // 60)
 
-class RateLimitMiddleware:
+def rate_limit_rule(method: str, path: str) -> Optional[Tuple[int, str]]:
+    if method == "GET" and path.endswith("/balance"):
+        return settings.RATE_LIMIT_PER_MIN_BALANCE, "balance"
+    if method == "POST" and path == "/transfers":
+        return settings.RATE_LIMIT_PER_MIN_TRANSFER, "transfer"
+    return None
+
+def rate_limit_key(request: Request, scope, route_tag: str, ts: float) -> str:
+    auth = request.headers.get("authorization", "")
+    if auth.lower().startswith("bearer "):
+        user_or_ip = auth[-24:]
+    else:
+        client = scope.get("client")
+        user_or_ip = client[0] if client else "unknown"
+    return f"rl:{user_or_ip}:{route_tag}:{_minute_bucket(ts)}"
+
+class LocalRateLimiter:
     '''
-    Simple fixed-window rate limiting backed by Redis.
+    In-process fixed-window counter used while Redis is unavailable.
 
-    Keys:
-      rl:{user_or_ip}:{route}:{minute_bucket}
-
-    Limits:
-      - GET */balance  -> RATE_LIMIT_PER_MIN_BALANCE
-      - POST /transfers -> RATE_LIMIT_PER_MIN_TRANSFER
+    Approximate: each worker process counts on its own, so the effective
+    limit across N workers is up to N x limit.
     '''
-    def __init__(self, app, redis):
-        self.app = app
-        self.redis = redis
-
-    async def __call__(self, scope, receive, send):
-        if scope["type"] != "http":
-            await self.app(scope, receive, send)
-            return
-
-        request = Request(scope, receive=receive)
-        path = scope.get("path", "")
-        method = scope.get("method", "GET").upper()
-
-        if method == "GET" and path.endswith("/balance"):
-            limit = settings.RATE_LIMIT_PER_MIN_BALANCE
-            route_tag = "balance"
-        elif method == "POST" and path == "/transfers":
-            limit = settings.RATE_LIMIT_PER_MIN_TRANSFER
-            route_tag = "transfer"
-        else:
-            await self.app(scope, receive, send)
-            return
-
-        auth = request.headers.get("authorization", "")
-        user_or_ip = "anonymous"
-        if auth.lower().startswith("bearer "):
-            user_or_ip = auth[-24:]
-        else:
-            client = scope.get("client")
-            user_or_ip = client[0] if client else "unknown"
-
-        bucket = _minute_bucket(time.time())
-        key = f"rl:{user_or_ip}:{route_tag}:{bucket}"
-
-        count = await self.redis.incr(key)
-        if count == 1:
-            await self.redis.expire(key, 70)
-
-        if count > limit:
-            resp = JSONResponse(
-                status_code=429,
-                content={"detail": "Too Many Requests", "limit_per_min": limit, "route": route_tag},
-            )
-            await resp(scope, receive, send)
-            return
-
-        await self.app(scope, receive, send)
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+        self.bucket: int | None = None
+
+    def incr(self, key: str, ts: float) -> int:
+        bucket = _minute_bucket(ts)
+        if bucket != self.bucket:
+            # Keys embed the minute bucket, so older windows can be dropped wholesale
+            self.counts.clear()
+            self.bucket = bucket
+        self.counts[key] = self.counts.get(key, 0) + 1
+        return self.counts[key]
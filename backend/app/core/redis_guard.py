@@ -0,0 +1,135 @@
+from __future__ import annotations
+import asyncio
+import json
+import time
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.idempotency import IDEMPOTENCY_TTL_SECONDS, idempotency_cache_key
+from app.core.rate_limit import LocalRateLimiter, rate_limit_key, rate_limit_rule
+
+# KEYS[1] = rate limit key, KEYS[2] = optional idempotency key.
+# A cached replay is returned without INCR, so retries never spend rate budget.
+GUARD_SCRIPT = """
+if #KEYS > 1 then
+  local cached = redis.call('GET', KEYS[2])
+  if cached then return {0, cached} end
+end
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then redis.call('EXPIRE', KEYS[1], ARGV[1]) end
+return {count}
+"""
+
+class RedisGuardMiddleware:
+    '''
+    Rate limiting + idempotency in one Redis round trip per request.
+
+    - GET */balance   -> GUARD_SCRIPT: INCR rl (+ EXPIRE on first hit)
+    - POST /transfers -> GUARD_SCRIPT: GET idem, else INCR rl
+      (and a SETEX of the response afterwards when an Idempotency-Key is sent)
+
+    A cached Idempotency-Key replay is served before the rate limit check and
+    does not count toward it, as when idempotency ran as the outer middleware.
+
+    Every Redis call is bounded by timeout_seconds and reported to the circuit
+    breaker. While the breaker is open the middleware runs degraded:
+      - rate limit  -> per-process LocalRateLimiter (approximate)
+      - idempotency -> skipped here; the uq_transfer_idem constraint and
+        create_transfer's replay lookup stop the duplicate instead
+    '''
+    def __init__(self, app, redis, breaker: CircuitBreaker, timeout_seconds: float = 0.1, ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS):
+        self.app = app
+        self.redis = redis
+        self.breaker = breaker
+        self.timeout = timeout_seconds
+        self.ttl = ttl_seconds
+        self.local_limiter = LocalRateLimiter()
+
+    async def _redis_call(self, build_pipeline):
+        '''Run one pipelined exchange; returns None if skipped or failed.'''
+        if not self.breaker.allow():
+            return None
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            build_pipeline(pipe)
+            results = await asyncio.wait_for(pipe.execute(), timeout=self.timeout)
+        except Exception:
+            self.breaker.record_failure()
+            return None
+        except BaseException:
+            # Cancelled mid-call: free the half-open probe slot, then propagate
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return results
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive=receive)
+        path = scope.get("path", "")
+        method = scope.get("method", "GET").upper()
+
+        rule = rate_limit_rule(method, path)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+        limit, route_tag = rule
+
+        now = time.time()
+        rl_key = rate_limit_key(request, scope, route_tag, now)
+        idem_key = idempotency_cache_key(request, path) if route_tag == "transfer" else None
+
+        keys = [rl_key, idem_key] if idem_key else [rl_key]
+        results = await self._redis_call(lambda pipe: pipe.eval(GUARD_SCRIPT, len(keys), *keys, 70))
+        if results is not None:
+            reply = results[0]
+            count = reply[0]
+            cached = reply[1] if len(reply) > 1 else None
+        else:
+            count = self.local_limiter.incr(rl_key, now)
+            cached = None
+
+        if cached:
+            payload = json.loads(cached)
+            resp = JSONResponse(status_code=payload["status_code"], content=payload["json"])
+            await resp(scope, receive, send)
+            return
+
+        if count > limit:
+            resp = JSONResponse(
+                status_code=429,
+                content={"detail": "Too Many Requests", "limit_per_min": limit, "route": route_tag},
+            )
+            await resp(scope, receive, send)
+            return
+
+        if not idem_key:
+            await self.app(scope, receive, send)
+            return
+
+        body_chunks = []
+        status_code_holder = {"status": 200}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code_holder["status"] = message["status"]
+            if message["type"] == "http.response.body":
+                body_chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        try:
+            body = b"".join(body_chunks).decode("utf-8") if body_chunks else ""
+            data = json.loads(body) if body else None
+        except Exception:
+            data = None
+        # Skip the write if Redis already failed or was bypassed for this request,
+        # so an outage costs one timeout per request rather than two.
+        if data is not None and results is not None:
+            record = json.dumps({"status_code": status_code_holder["status"], "json": data})
+            await self._redis_call(lambda pipe: pipe.setex(idem_key, self.ttl, record))
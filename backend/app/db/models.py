@@ -1,9 +1,9 @@
 from __future__ import annotations
-from datetime import datetime
+from datetime import datetime, date
 import enum
 
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Numeric, Text, UniqueConstraint
+from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, Index, Numeric, Text, UniqueConstraint
 
 class Base(DeclarativeBase):
     pass
@@ -18,6 +18,18 @@ class TransferStatus(str, enum.Enum):
     success = "SUCCESS"
     failed = "FAILED"
 
+class ScheduleFrequency(str, enum.Enum):
+    once = "once"
+    daily = "daily"
+    weekly = "weekly"
+    monthly = "monthly"
+
+class ScheduleStatus(str, enum.Enum):
+    active = "active"
+    completed = "completed"
+    failed = "failed"
+    cancelled = "cancelled"
+
 class User(Base):
     __tablename__ = "users"
     user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -54,6 +66,17 @@ class LedgerEntry(Base):
     ref_transfer_id: Mapped[str] = mapped_column(String(36), index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+class DailyAccountSummary(Base):
+    __tablename__ = "daily_account_summary"
+    # (account_id, day) primary key doubles as the range-scan index for /summary
+    account_id: Mapped[str] = mapped_column(ForeignKey("accounts.account_id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    inflow_total: Mapped[float] = mapped_column(Numeric(18, 2), default=0)
+    inflow_count: Mapped[int] = mapped_column(Integer, default=0)
+    outflow_total: Mapped[float] = mapped_column(Numeric(18, 2), default=0)
+    outflow_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
 class Transfer(Base):
     __tablename__ = "transfers"
     transfer_id: Mapped[str] = mapped_column(String(36), primary_key=True)
@@ -68,6 +91,29 @@ class Transfer(Base):
         UniqueConstraint("from_acct", "to_acct", "amount", "idempotency_key", name="uq_transfer_idem"),
     )
 
+class ScheduledTransfer(Base):
+    __tablename__ = "scheduled_transfers"
+    scheduled_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    owner_user_id: Mapped[int] = mapped_column(ForeignKey("users.user_id"), index=True)
+    from_acct: Mapped[str] = mapped_column(String(32), index=True)
+    to_acct: Mapped[str] = mapped_column(String(32))
+    amount: Mapped[float] = mapped_column(Numeric(18, 2))
+    frequency: Mapped[str] = mapped_column(String(16), default=ScheduleFrequency.once.value)
+    starts_at: Mapped[datetime] = mapped_column(DateTime)  # first occurrence, anchor for recurrence
+    scheduled_for: Mapped[datetime] = mapped_column(DateTime)  # nominal time of the next occurrence
+    next_run_at: Mapped[datetime] = mapped_column(DateTime)  # scheduled_for + spread offset
+    runs_done: Mapped[int] = mapped_column(Integer, default=0)
+    max_runs: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    status: Mapped[str] = mapped_column(String(16), default=ScheduleStatus.active.value)
+    last_transfer_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    last_status: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_scheduled_transfers_due", "status", "next_run_at"),
+    )
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
     audit_id: Mapped[int] = mapped_column(Integer, primary_key=True)
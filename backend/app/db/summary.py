@@ -0,0 +1,129 @@
+'''
+Per-account daily inflow/outflow rollup.
+
+- Live path: bump_daily_summary() runs inside the transfer transaction, right
+  after the ledger entries are written, while the account rows are locked.
+- History: backfill_daily_summaries() rebuilds rows from ledger_entries in
+  chunks of accounts. Run it once after deploying:
+      python -m app.db.summary --chunk-size 100
+'''
+
+from __future__ import annotations
+import argparse
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, case, cast, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, DailyAccountSummary, LedgerEntry
+
+def bump_daily_summary(db: Session, account_id: str, day: date, direction: str, amount: Decimal):
+    is_credit = direction == "CREDIT"
+    stmt = pg_insert(DailyAccountSummary).values(
+        account_id=account_id,
+        day=day,
+        inflow_total=amount if is_credit else Decimal("0"),
+        inflow_count=1 if is_credit else 0,
+        outflow_total=Decimal("0") if is_credit else amount,
+        outflow_count=0 if is_credit else 1,
+        updated_at=datetime.utcnow(),
+    )
+    cols = DailyAccountSummary.__table__.c
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[cols.account_id, cols.day],
+        set_={
+            "inflow_total": cols.inflow_total + stmt.excluded.inflow_total,
+            "inflow_count": cols.inflow_count + stmt.excluded.inflow_count,
+            "outflow_total": cols.outflow_total + stmt.excluded.outflow_total,
+            "outflow_count": cols.outflow_count + stmt.excluded.outflow_count,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+
+def _rebuild_accounts(db: Session, account_ids: list[str]):
+    # Same sorted FOR UPDATE order as transfers, so live bumps for these
+    # accounts wait until the rebuilt rows are committed.
+    for aid in sorted(account_ids):
+        db.execute(text("SELECT account_id FROM accounts WHERE account_id = :aid FOR UPDATE"), {"aid": aid})
+
+    day = cast(LedgerEntry.created_at, Date)
+    credit = LedgerEntry.direction == "CREDIT"
+    debit = LedgerEntry.direction == "DEBIT"
+    agg = (
+        select(
+            LedgerEntry.account_id,
+            day,
+            func.coalesce(func.sum(case((credit, LedgerEntry.amount), else_=0)), 0),
+            func.count().filter(credit),
+            func.coalesce(func.sum(case((debit, LedgerEntry.amount), else_=0)), 0),
+            func.count().filter(debit),
+            # Naive UTC, same as datetime.utcnow() on the live path
+            func.timezone("utc", func.now()),
+        )
+        .where(LedgerEntry.account_id.in_(account_ids))
+        .group_by(LedgerEntry.account_id, day)
+    )
+    stmt = pg_insert(DailyAccountSummary).from_select(
+        ["account_id", "day", "inflow_total", "inflow_count", "outflow_total", "outflow_count", "updated_at"],
+        agg,
+    )
+    # Overwrite rather than add: rebuilding is idempotent and safe to re-run.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["account_id", "day"],
+        set_={
+            "inflow_total": stmt.excluded.inflow_total,
+            "inflow_count": stmt.excluded.inflow_count,
+            "outflow_total": stmt.excluded.outflow_total,
+            "outflow_count": stmt.excluded.outflow_count,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+
+def backfill_daily_summaries(db: Session, chunk_size: int = 100) -> int:
+    '''
+    Rebuild daily_account_summary from ledger_entries, one transaction per
+    chunk of accounts. Returns the number of accounts processed.
+    '''
+    processed = 0
+    last_id = ""
+    while True:
+        ids = [
+            r[0]
+            for r in db.query(Account.account_id)
+            .filter(Account.account_id > last_id)
+            .order_by(Account.account_id)
+            .limit(chunk_size)
+            .all()
+        ]
+        if not ids:
+            break
+        try:
+            _rebuild_accounts(db, ids)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        processed += len(ids)
+        last_id = ids[-1]
+    return processed
+
+if __name__ == "__main__":
+    from app.db.models import Base
+    from app.db.session import SessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Backfill daily_account_summary from ledger_entries")
+    parser.add_argument("--chunk-size", type=int, default=100, help="accounts per transaction")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        n = backfill_daily_summaries(db, chunk_size=args.chunk_size)
+        print(f"backfilled daily summaries for {n} accounts")
+    finally:
+        db.close()
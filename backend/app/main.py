@@ -5,11 +5,11 @@ from redis.asyncio import Redis
 from passlib.context import CryptContext
 
 from app.core.config import settings
-from app.core.rate_limit import RateLimitMiddleware
-from app.core.idempotency import IdempotencyMiddleware
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.redis_guard import RedisGuardMiddleware
 from app.db.session import engine, SessionLocal
 from app.db.models import Base, User, Account, AccountBalance
-from app.routers import auth, accounts, transfers, webhooks
+from app.routers import auth, accounts, transfers, scheduled_transfers, webhooks
 
 app = FastAPI(title="Lab9 Mock Bank API (BaaS Starter Kit)", version="1.0.0")
 
@@ -21,13 +21,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
-app.add_middleware(RateLimitMiddleware, redis=redis_client)
-app.add_middleware(IdempotencyMiddleware, redis=redis_client, ttl_seconds=24 * 3600)
+redis_client = Redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_timeout=settings.REDIS_TIMEOUT_SECONDS,
+    socket_connect_timeout=settings.REDIS_TIMEOUT_SECONDS,
+)
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.REDIS_BREAKER_RESET_SECONDS,
+)
+app.add_middleware(
+    RedisGuardMiddleware,
+    redis=redis_client,
+    breaker=redis_breaker,
+    timeout_seconds=settings.REDIS_TIMEOUT_SECONDS,
+    ttl_seconds=24 * 3600,
+)
 
 app.include_router(auth.router)
 app.include_router(accounts.router)
 app.include_router(transfers.router)
+app.include_router(scheduled_transfers.router)
 app.include_router(webhooks.router)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -81,3 +97,8 @@ def startup():
 @app.get("/health")
 def health():
     return {"ok": True}
+
+@app.get("/health/redis")
+def health_redis():
+    # closed = Redis in use; open/half_open = degraded in-process fallback
+    return redis_breaker.snapshot()
@@ -1,11 +1,15 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.security import get_current_user_id
 from app.db.session import get_db
-from app.db.models import Account, AccountBalance, LedgerEntry, AccountStatus
+from app.db.models import Account, AccountBalance, LedgerEntry, AccountStatus, DailyAccountSummary
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
@@ -48,6 +52,57 @@ def get_transactions(account_id: str, limit: int = 50, user_id: str = Depends(ge
         for e in entries
     ]
 
+@router.get("/{account_id}/summary")
+def get_summary(
+    account_id: str,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    acct = db.query(Account).filter(Account.account_id == account_id).first()
+    if not acct or acct.owner_user_id != int(user_id):
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    date_to = date_to or datetime.utcnow().date()
+    # Both bounds are inclusive: the default covers 30 days, the cap 366 days
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="from must be on or before to")
+    if (date_to - date_from).days >= 366:
+        raise HTTPException(status_code=400, detail="range must not exceed 366 days")
+
+    rows = (
+        db.query(DailyAccountSummary)
+        .filter(
+            DailyAccountSummary.account_id == account_id,
+            DailyAccountSummary.day >= date_from,
+            DailyAccountSummary.day <= date_to,
+        )
+        .order_by(DailyAccountSummary.day)
+        .all()
+    )
+    days = [
+        {
+            "day": r.day.isoformat(),
+            "inflow_total": float(r.inflow_total),
+            "inflow_count": r.inflow_count,
+            "outflow_total": float(r.outflow_total),
+            "outflow_count": r.outflow_count,
+        }
+        for r in rows
+    ]
+    return {
+        "account_id": account_id,
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "inflow_total": float(sum((r.inflow_total for r in rows), Decimal("0"))),
+        "inflow_count": sum(r.inflow_count for r in rows),
+        "outflow_total": float(sum((r.outflow_total for r in rows), Decimal("0"))),
+        "outflow_count": sum(r.outflow_count for r in rows),
+        "days": days,
+    }
+
 @router.patch("/{account_id}/status")
 def update_account_status(
     account_id: str,
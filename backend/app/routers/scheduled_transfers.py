@@ -0,0 +1,146 @@
+from __future__ import annotations
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, PositiveFloat, PositiveInt, field_validator
+from sqlalchemy.orm import Session
+
+from app.core.security import get_current_user_id
+from app.db.session import get_db
+from app.db.models import Account, ScheduledTransfer, ScheduleFrequency, ScheduleStatus
+from app.routers.transfers import _check_cents, _write_audit
+from app.scheduler import spread_offset
+
+router = APIRouter(prefix="/scheduled-transfers", tags=["scheduled-transfers"])
+
+class ScheduledTransferRequest(BaseModel):
+    from_acct: str
+    to_acct: str
+    amount: PositiveFloat
+    run_at: datetime
+    frequency: str = ScheduleFrequency.once.value  # once | daily | weekly | monthly
+    max_runs: Optional[PositiveInt] = None
+
+    @field_validator("amount")
+    @classmethod
+    def amount_in_cents(cls, v: float) -> float:
+        return _check_cents(v)
+
+def _to_utc_naive(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts
+    return ts.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _serialize(s: ScheduledTransfer) -> dict:
+    return {
+        "scheduled_id": s.scheduled_id,
+        "from_acct": s.from_acct,
+        "to_acct": s.to_acct,
+        "amount": float(s.amount),
+        "frequency": s.frequency,
+        "next_run_at": s.scheduled_for.isoformat(),
+        "runs_done": s.runs_done,
+        "max_runs": s.max_runs,
+        "status": s.status,
+        "last_transfer_id": s.last_transfer_id,
+        "last_status": s.last_status,
+        "created_at": s.created_at.isoformat(),
+    }
+
+@router.post("")
+def create_scheduled_transfer(
+    payload: ScheduledTransferRequest,
+    request: Request,
+    user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    valid_frequencies = [f.value for f in ScheduleFrequency]
+    if payload.frequency not in valid_frequencies:
+        raise HTTPException(status_code=400, detail=f"Invalid frequency. Must be one of: {', '.join(valid_frequencies)}")
+    if payload.from_acct == payload.to_acct:
+        raise HTTPException(status_code=400, detail="Cannot transfer to the same account")
+
+    from_account = db.query(Account).filter(Account.account_id == payload.from_acct).first()
+    to_account = db.query(Account).filter(Account.account_id == payload.to_acct).first()
+
+    if not from_account or from_account.owner_user_id != int(user_id):
+        raise HTTPException(status_code=404, detail="from_acct not found or not owned by user")
+    if not to_account:
+        raise HTTPException(status_code=404, detail="to_acct not found")
+    if from_account.status == "closed":
+        raise HTTPException(status_code=403, detail="Source account is closed")
+    if to_account.status == "closed":
+        raise HTTPException(status_code=403, detail="Destination account is closed")
+
+    # Frozen accounts may still hold standing orders; each run re-checks status
+    # inside _apply_transfer_atomic and fails that occurrence only.
+    scheduled_id = str(uuid.uuid4())
+    run_at = _to_utc_naive(payload.run_at)
+    s = ScheduledTransfer(
+        scheduled_id=scheduled_id,
+        owner_user_id=int(user_id),
+        from_acct=payload.from_acct,
+        to_acct=payload.to_acct,
+        amount=Decimal(str(payload.amount)),
+        frequency=payload.frequency,
+        starts_at=run_at,
+        scheduled_for=run_at,
+        next_run_at=run_at + spread_offset(scheduled_id),
+        runs_done=0,
+        max_runs=payload.max_runs,
+        status=ScheduleStatus.active.value,
+    )
+    db.add(s)
+    _write_audit(
+        db,
+        actor_user_id=int(user_id),
+        action="scheduled_transfer_create",
+        object_type="scheduled_transfer",
+        object_id=scheduled_id,
+        request_id=request.headers.get("x-request-id"),
+        meta={"from": payload.from_acct, "to": payload.to_acct, "amount": float(payload.amount), "frequency": payload.frequency, "run_at": run_at.isoformat()},
+    )
+    db.commit()
+    return _serialize(s)
+
+@router.get("")
+def list_scheduled_transfers(user_id: str = Depends(get_current_user_id), db: Session = Depends(get_db)):
+    rows = (
+        db.query(ScheduledTransfer)
+        .filter(ScheduledTransfer.owner_user_id == int(user_id))
+        .order_by(ScheduledTransfer.created_at.desc())
+        .limit(200)
+        .all()
+    )
+    return {"scheduled_transfers": [_serialize(s) for s in rows]}
+
+@router.delete("/{scheduled_id}")
+def cancel_scheduled_transfer(
+    scheduled_id: str,
+    request: Request,
+    user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    # Row lock so a cancel cannot interleave with a scheduler run of the same item
+    s = db.query(ScheduledTransfer).filter(ScheduledTransfer.scheduled_id == scheduled_id).with_for_update().first()
+    if not s or s.owner_user_id != int(user_id):
+        raise HTTPException(status_code=404, detail="Scheduled transfer not found")
+    if s.status != ScheduleStatus.active.value:
+        raise HTTPException(status_code=400, detail=f"Scheduled transfer is already {s.status}")
+
+    s.status = ScheduleStatus.cancelled.value
+    s.updated_at = datetime.utcnow()
+    _write_audit(
+        db,
+        actor_user_id=int(user_id),
+        action="scheduled_transfer_cancel",
+        object_type="scheduled_transfer",
+        object_id=scheduled_id,
+        request_id=request.headers.get("x-request-id"),
+        meta={},
+    )
+    db.commit()
+    return _serialize(s)
@@ -4,26 +4,45 @@ import asyncio
 from decimal import Decimal
 from typing import Optional
 import json
+from datetime import datetime
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks
-from pydantic import BaseModel, PositiveFloat
+from pydantic import BaseModel, PositiveFloat, field_validator
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, IntegrityError
 
 from app.core.security import get_current_user_id
 from app.core.config import settings
 from app.db.session import get_db, SessionLocal
 from app.db.models import Account, AccountBalance, LedgerEntry, Transfer, TransferStatus, AuditLog
+from app.db.summary import bump_daily_summary
 
 router = APIRouter(tags=["transfers"])
 
+def _check_cents(v: float) -> float:
+    # Numeric(18,2) would round silently, and the rounded value is what
+    # uq_transfer_idem compares, so refuse sub-cent amounts up front.
+    # JSON Infinity/NaN pass PositiveFloat, and have no numeric exponent.
+    d = Decimal(str(v))
+    if not d.is_finite():
+        raise ValueError("amount must be a finite number")
+    if d.as_tuple().exponent < -2:
+        raise ValueError("amount must have at most 2 decimal places")
+    return v
+
 class TransferRequest(BaseModel):
     from_acct: str
     to_acct: str
     amount: PositiveFloat
     mode: Optional[str] = "sync"  # sync | async
 
+    @field_validator("amount")
+    @classmethod
+    def amount_in_cents(cls, v: float) -> float:
+        return _check_cents(v)
+
 def _json_dumps(obj) -> str:
     return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
 
@@ -40,7 +59,43 @@ def _write_audit(db: Session, actor_user_id: int, action: str, object_type: str,
     )
 
 def _get_idem_key(request: Request) -> Optional[str]:
-    return request.headers.get("idempotency-key")
+    idem = request.headers.get("idempotency-key")
+    if idem and len(idem) > Transfer.__table__.c.idempotency_key.type.length:
+        raise HTTPException(status_code=400, detail="Idempotency-Key is too long")
+    return idem
+
+def _find_idempotent_transfer(db: Session, payload: TransferRequest, idem: str) -> Optional[Transfer]:
+    # Same columns as uq_transfer_idem, so this is served by the constraint's index
+    return (
+        db.query(Transfer)
+        .filter(
+            Transfer.from_acct == payload.from_acct,
+            Transfer.to_acct == payload.to_acct,
+            Transfer.amount == Decimal(str(payload.amount)),
+            Transfer.idempotency_key == idem,
+        )
+        .first()
+    )
+
+def _idempotent_replay(t: Transfer) -> dict:
+    '''
+    Database-backed replay, used when the Redis cache missed (degraded or
+    expired). Unlike the Redis path, which replays the original response
+    verbatim, this reports the transfer's current state with HTTP 200, so an
+    async transfer that has since failed replays as "failed" rather than
+    "accepted".
+
+    A failed sync transfer is rolled back together with its row, so there is
+    nothing to find here: in degraded mode a retry of it runs again (and
+    usually fails the same way), where the Redis path would replay the
+    cached 4xx.
+    '''
+    status = {
+        TransferStatus.success.value: "success",
+        TransferStatus.processing.value: "accepted",
+        TransferStatus.failed.value: "failed",
+    }.get(t.status, t.status)
+    return {"status": status, "transfer_id": t.transfer_id, "idempotent_replay": True}
 
 def _lock_account_row(db: Session, account_id: str):
     db.execute(text("SELECT account_id FROM accounts WHERE account_id = :aid FOR UPDATE"), {"aid": account_id})
@@ -83,8 +138,13 @@ def _apply_transfer_atomic(db: Session, from_acct: str, to_acct: str, amount: De
     from_bal.balance = Decimal(from_bal.balance) - amount
     to_bal.balance = Decimal(to_bal.balance) + amount
 
-    db.add(LedgerEntry(account_id=from_acct, direction="DEBIT", amount=amount, ref_transfer_id=transfer_id))
-    db.add(LedgerEntry(account_id=to_acct, direction="CREDIT", amount=amount, ref_transfer_id=transfer_id))
+    now = datetime.utcnow()
+    db.add(LedgerEntry(account_id=from_acct, direction="DEBIT", amount=amount, ref_transfer_id=transfer_id, created_at=now))
+    db.add(LedgerEntry(account_id=to_acct, direction="CREDIT", amount=amount, ref_transfer_id=transfer_id, created_at=now))
+
+    # Keep the daily rollup in step with the ledger while the rows are still locked
+    bump_daily_summary(db, from_acct, now.date(), "DEBIT", amount)
+    bump_daily_summary(db, to_acct, now.date(), "CREDIT", amount)
 
 @router.post("/transfers")
 async def create_transfer(
@@ -102,6 +162,16 @@ async def create_transfer(
 
     if not from_account or from_account.owner_user_id != int(user_id):
         raise HTTPException(status_code=404, detail="from_acct not found or not owned by user")
+
+    # Fallback for when the Redis idempotency cache is degraded or has expired.
+    # Checked before the status rules so a retry of a transfer that already
+    # went through replays it even if an account was frozen since.
+    idem = _get_idem_key(request)
+    if idem:
+        existing = _find_idempotent_transfer(db, payload, idem)
+        if existing:
+            return _idempotent_replay(existing)
+
     if not to_account:
         raise HTTPException(status_code=404, detail="to_acct not found")
 
@@ -115,7 +185,6 @@ async def create_transfer(
         raise HTTPException(status_code=403, detail="Destination account is closed")
 
     transfer_id = str(uuid.uuid4())
-    idem = _get_idem_key(request)
 
     t = Transfer(
         transfer_id=transfer_id,
@@ -126,6 +195,18 @@ async def create_transfer(
         idempotency_key=idem,
     )
     db.add(t)
+    try:
+        db.flush()
+    except IntegrityError:
+        # Concurrent request with the same key won the uq_transfer_idem race
+        db.rollback()
+        existing = _find_idempotent_transfer(db, payload, idem) if idem else None
+        if not existing:
+            raise HTTPException(status_code=409, detail="Conflicting transfer")
+        return _idempotent_replay(existing)
+    except DBAPIError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Transaction Failed")
 
     req_id = request.headers.get("x-request-id")
     _write_audit(
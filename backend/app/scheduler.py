@@ -0,0 +1,247 @@
+'''
+Scheduled / recurring transfer runner.
+
+Run as its own process:
+    python -m app.scheduler
+
+Each tick claims up to SCHEDULER_BATCH_SIZE due rows from scheduled_transfers
+with FOR UPDATE SKIP LOCKED (so several runners never pick the same row),
+locks every account touched by the batch once in sorted order, and executes
+each occurrence through _apply_transfer_atomic inside a savepoint, so a
+frozen/closed account or insufficient funds fails that occurrence only.
+
+Due times carry a per-schedule offset of up to SCHEDULER_SPREAD_SECONDS, so
+standing orders set for midnight are drained over a window instead of all at
+once.
+
+Catch-up after downtime: if several occurrences of a recurring schedule are
+already due, only the latest runs; the older ones are skipped and audited as
+scheduled_transfer_skip. One-off schedules always run, however late.
+
+Schema: tables are created by the API process on startup; until they exist
+each tick fails, is logged, and is retried.
+'''
+
+from __future__ import annotations
+import asyncio
+import calendar
+import logging
+import random
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.models import ScheduledTransfer, ScheduleFrequency, ScheduleStatus, Transfer, TransferStatus
+from app.routers.transfers import _apply_transfer_atomic, _lock_account_row, _notify_webhook, _write_audit
+
+logger = logging.getLogger(__name__)
+
+def _add_months(ts: datetime, months: int) -> datetime:
+    month_index = ts.month - 1 + months
+    year = ts.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(ts.day, calendar.monthrange(year, month)[1])
+    return ts.replace(year=year, month=month, day=day)
+
+def occurrence_at(starts_at: datetime, frequency: str, n: int) -> datetime:
+    # Computed from the anchor rather than the previous run, so a 31st-of-month
+    # order clipped to Feb 28 goes back to the 31st in March.
+    if frequency == ScheduleFrequency.daily.value:
+        return starts_at + timedelta(days=n)
+    if frequency == ScheduleFrequency.weekly.value:
+        return starts_at + timedelta(weeks=n)
+    if frequency == ScheduleFrequency.monthly.value:
+        return _add_months(starts_at, n)
+    return starts_at
+
+def spread_offset(scheduled_id: str) -> timedelta:
+    spread = settings.SCHEDULER_SPREAD_SECONDS
+    if spread <= 0:
+        return timedelta(0)
+    return timedelta(seconds=zlib.crc32(scheduled_id.encode()) % spread)
+
+def _claim_due(db: Session, now: datetime, limit: int) -> list[ScheduledTransfer]:
+    return (
+        db.query(ScheduledTransfer)
+        .filter(ScheduledTransfer.status == ScheduleStatus.active.value, ScheduledTransfer.next_run_at <= now)
+        .order_by(ScheduledTransfer.next_run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+def _advance(s: ScheduledTransfer, ok: bool, now: datetime):
+    s.runs_done += 1
+    s.updated_at = now
+    finished = s.frequency == ScheduleFrequency.once.value or (s.max_runs is not None and s.runs_done >= s.max_runs)
+    if finished:
+        if s.frequency == ScheduleFrequency.once.value and not ok:
+            s.status = ScheduleStatus.failed.value
+        else:
+            s.status = ScheduleStatus.completed.value
+        return
+    s.scheduled_for = occurrence_at(s.starts_at, s.frequency, s.runs_done)
+    s.next_run_at = s.scheduled_for + spread_offset(s.scheduled_id)
+
+def _skip_missed(db: Session, s: ScheduledTransfer, now: datetime) -> int:
+    '''
+    Catch-up policy for recurring schedules after scheduler downtime: when
+    several occurrences are already due, all but the latest are skipped
+    (counted in runs_done, never debited) and the latest runs now, however
+    late. A daily order missed for N days therefore pays exactly once on
+    recovery. The last run allowed by max_runs is never skipped, and one-off
+    schedules are never skipped.
+    '''
+    if s.frequency == ScheduleFrequency.once.value:
+        return 0
+    offset = spread_offset(s.scheduled_id)
+    first_missed = s.scheduled_for
+    skipped = 0
+    while s.max_runs is None or s.runs_done + 1 < s.max_runs:
+        following = occurrence_at(s.starts_at, s.frequency, s.runs_done + 1)
+        if following + offset > now:
+            break
+        s.runs_done += 1
+        skipped += 1
+        s.scheduled_for = following
+    if not skipped:
+        return 0
+
+    s.next_run_at = s.scheduled_for + offset
+    s.updated_at = now
+    _write_audit(
+        db,
+        actor_user_id=s.owner_user_id,
+        action="scheduled_transfer_skip",
+        object_type="scheduled_transfer",
+        object_id=s.scheduled_id,
+        request_id=None,
+        meta={"skipped": skipped, "first_missed": first_missed.isoformat(), "running": s.scheduled_for.isoformat()},
+    )
+    return skipped
+
+def _execute_one(db: Session, s: ScheduledTransfer, now: datetime) -> tuple[str | None, str]:
+    transfer_id = str(uuid.uuid4())
+    amount = Decimal(str(s.amount))
+    # One key per occurrence: uq_transfer_idem rejects a second execution
+    idem = f"sched:{s.scheduled_id}:{s.scheduled_for.isoformat()}"
+
+    status = TransferStatus.success.value
+    detail = None
+    sp = db.begin_nested()
+    try:
+        db.add(Transfer(
+            transfer_id=transfer_id,
+            from_acct=s.from_acct,
+            to_acct=s.to_acct,
+            amount=amount,
+            status=TransferStatus.success.value,
+            idempotency_key=idem,
+        ))
+        db.flush()
+        _apply_transfer_atomic(db, s.from_acct, s.to_acct, amount, transfer_id)
+        sp.commit()
+    except Exception as e:
+        # Only this occurrence is undone; the rest of the batch still commits
+        sp.rollback()
+        status = TransferStatus.failed.value
+        if isinstance(e, HTTPException):
+            detail = e.detail
+        else:
+            detail = type(e).__name__
+            logger.exception("scheduled transfer %s failed", s.scheduled_id)
+
+    if status == TransferStatus.failed.value:
+        # Keep a FAILED transfer row when possible; if the insert itself was
+        # what failed (e.g. duplicate key), record the outcome without one.
+        sp = db.begin_nested()
+        try:
+            db.add(Transfer(
+                transfer_id=transfer_id,
+                from_acct=s.from_acct,
+                to_acct=s.to_acct,
+                amount=amount,
+                status=TransferStatus.failed.value,
+                idempotency_key=idem,
+            ))
+            db.flush()
+            sp.commit()
+        except Exception:
+            sp.rollback()
+            transfer_id = None
+
+    _write_audit(
+        db,
+        actor_user_id=s.owner_user_id,
+        action="scheduled_transfer_execute",
+        object_type="scheduled_transfer",
+        object_id=s.scheduled_id,
+        request_id=None,
+        meta={"transfer_id": transfer_id, "scheduled_for": s.scheduled_for.isoformat(), "status": status, "detail": detail},
+    )
+    s.last_transfer_id = transfer_id
+    s.last_status = status
+    _advance(s, status == TransferStatus.success.value, now)
+    return transfer_id, status
+
+def run_batch(db: Session) -> list[tuple[str, str]]:
+    '''
+    Claim and execute one batch of due scheduled transfers in a single
+    transaction. Returns (transfer_id, status) for each executed occurrence;
+    transfer_id is None when no transfer row could be recorded.
+    '''
+    now = datetime.utcnow()
+    due = _claim_due(db, now, settings.SCHEDULER_BATCH_SIZE)
+    if not due:
+        db.rollback()
+        return []
+
+    # Lock each account once, in the same sorted order _apply_transfer_atomic
+    # uses, so the per-item locks below are re-entrant no-ops and cannot
+    # deadlock with API transfers.
+    for aid in sorted({a for s in due for a in (s.from_acct, s.to_acct)}):
+        _lock_account_row(db, aid)
+
+    results = []
+    try:
+        for s in sorted(due, key=lambda x: (x.from_acct, x.next_run_at)):
+            # Leaves s on its latest due occurrence, which always runs below
+            _skip_missed(db, s, now)
+            results.append(_execute_one(db, s, now))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return results
+
+async def run_forever():
+    while True:
+        db = SessionLocal()
+        try:
+            results = run_batch(db)
+        except Exception:
+            logger.exception("scheduler batch failed")
+            results = []
+        finally:
+            db.close()
+
+        for transfer_id, status in results:
+            if transfer_id:
+                await _notify_webhook(transfer_id, status)
+
+        if len(results) >= settings.SCHEDULER_BATCH_SIZE:
+            # Backlog remains: keep draining, with a short jittered pause
+            await asyncio.sleep(random.uniform(0.05, 0.25))
+        else:
+            poll = settings.SCHEDULER_POLL_SECONDS
+            await asyncio.sleep(poll * random.uniform(0.8, 1.2))
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(run_forever())